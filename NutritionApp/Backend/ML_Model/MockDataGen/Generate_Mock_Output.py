@@ -61,6 +61,16 @@ def calculate_daily_changes(prev_metrics, day_data):
     changes["muscleStrength"] = muscle_groups
     return changes
 
+def apply_daily_changes(current_metrics, changes):
+    #apply changes in place, cardio and muscle strength are clamped to [0, 110]
+    current_metrics["weightChange"] += changes["weightChange"]
+    current_metrics["cardiovascularEndurance"] = max(0, min(110, 
+        current_metrics["cardiovascularEndurance"] + changes["cardiovascularEndurance"]))
+    
+    for muscle, change in changes["muscleStrength"].items():
+        current_metrics["muscleStrength"][muscle] = max(0, min(110, 
+            current_metrics["muscleStrength"][muscle] + change))
+
 def generate_health_output(input_file, output_file):
     #load input data
     with open(input_file, 'r') as f:
@@ -108,13 +118,7 @@ def generate_health_output(input_file, output_file):
             changes = calculate_daily_changes(current_metrics, entries_by_date[date_str])
             
             #apply changes to current metrics
-            current_metrics["weightChange"] += changes["weightChange"]
-            current_metrics["cardiovascularEndurance"] = max(0, min(110, 
-                current_metrics["cardiovascularEndurance"] + changes["cardiovascularEndurance"]))
-            
-            for muscle, change in changes["muscleStrength"].items():
-                current_metrics["muscleStrength"][muscle] = max(0, min(110, 
-                    current_metrics["muscleStrength"][muscle] + change))
+            apply_daily_changes(current_metrics, changes)
         
         current_date += timedelta(days=1)
     
@@ -122,7 +126,8 @@ def generate_health_output(input_file, output_file):
     with open(output_file, 'w') as f:
         json.dump(output, f, indent=2)
 
-generate_health_output(
-    './mock_health_data.json',
-    './mock_health_output.json'
-)
\ No newline at end of file
+if __name__ == "__main__":
+    generate_health_output(
+        './mock_health_data.json',
+        './mock_health_output.json'
+    )
\ No newline at end of file
@@ -0,0 +1,210 @@
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+from habit_modification_model import HabitModificationModel
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+mock_data_dir = os.path.join(os.path.dirname(current_dir), 'MockDataGen')
+backend_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, mock_data_dir)
+
+from Generate_Mock_Data import load_data_files, generate_daily_entry
+from Generate_Mock_Output import calculate_daily_changes, apply_daily_changes
+
+MUSCLE_GROUPS = ['abdominals', 'abductors', 'adductors', 'biceps', 'calves',
+                 'chest', 'forearms', 'glutes', 'hamstrings', 'lats',
+                 'lowerback', 'middleback', 'neck', 'quadriceps', 'shoulders',
+                 'traps', 'triceps']
+
+TARGET_NAMES = ['weightChange', 'cardiovascularEndurance'] + [f'muscleStrength.{muscle}' for muscle in MUSCLE_GROUPS]
+
+#the simulator spells these muscles in camelCase, the model's target order uses lowercase
+SIMULATOR_MUSCLE_KEYS = {'lowerback': 'lowerBack', 'middleback': 'middleBack'}
+
+#_process_target looks up the lowercase keys, so training labels for these never moved off 100
+LABEL_MISMATCH_NOTE = (
+    "Training labels have the same key mismatch: _process_target reads lowerback/middleback while the "
+    "simulator writes lowerBack/middleBack, so the model was trained on a constant 0 change for both."
+)
+
+BASELINE_METRICS = {
+    "weightChange": 0.0,
+    "cardiovascularEndurance": 100.0,
+    "muscleStrength": {
+        "abdominals": 100.0, "abductors": 100.0, "adductors": 100.0,
+        "biceps": 100.0, "calves": 100.0, "chest": 100.0,
+        "forearms": 100.0, "glutes": 100.0, "hamstrings": 100.0,
+        "lats": 100.0, "lowerBack": 100.0, "middleBack": 100.0,
+        "neck": 100.0, "quadriceps": 100.0, "shoulders": 100.0,
+        "traps": 100.0, "triceps": 100.0
+    }
+}
+
+
+def generate_held_out_users(num_users: int, seed: int):
+    """Generate one fresh mock day per user, the model only extrapolates from the last logged entry."""
+    random.seed(seed)
+    exercise_data, workout_data, nutrition_data = load_data_files()
+    today = datetime.now()
+    return [generate_daily_entry(today, exercise_data, workout_data, nutrition_data) for _ in range(num_users)]
+
+
+def generate_future_entries(model: HabitModificationModel, last_entries, max_horizon: int, seed: int):
+    """Roll each user forward the same way extrapolate_future_metrics does, so model and simulator see identical days."""
+    np.random.seed(seed)
+    rollouts = []
+    for entry in last_entries:
+        days = []
+        current_entry = entry
+        for _ in range(max_horizon):
+            current_entry = model._generate_future_entry([current_entry])
+            days.append(current_entry)
+        rollouts.append(days)
+    return rollouts
+
+
+def simulator_targets(metrics) -> np.ndarray:
+    """Simulator metrics as a vector in the model's target order."""
+    muscle_strength = metrics['muscleStrength']
+    return np.array([metrics['weightChange'], metrics['cardiovascularEndurance']] + [
+        muscle_strength[SIMULATOR_MUSCLE_KEYS.get(muscle, muscle)] for muscle in MUSCLE_GROUPS
+    ])
+
+
+def simulate_cumulative_changes(rollouts, horizons):
+    """Ground truth total change per horizon from the mock output simulator, shape (users, horizons, targets)."""
+    baseline = simulator_targets(BASELINE_METRICS)
+    truth = np.zeros((len(rollouts), len(horizons), len(TARGET_NAMES)))
+    for user, days in enumerate(rollouts):
+        metrics = copy.deepcopy(BASELINE_METRICS)
+        for day, entry in enumerate(days, start=1):
+            apply_daily_changes(metrics, calculate_daily_changes(metrics, entry))
+            if day in horizons:
+                truth[user, horizons.index(day)] = simulator_targets(metrics) - baseline
+    return truth
+
+
+def predict_cumulative_changes(model: HabitModificationModel, rollouts, horizons):
+    """Model total change per horizon, one batched forward pass per day across all users."""
+    predicted = np.zeros((len(rollouts), len(horizons), len(TARGET_NAMES)))
+    total_changes = np.zeros((len(rollouts), len(TARGET_NAMES)))
+    timings = {'feature_extraction': 0.0, 'scaling': 0.0, 'inference': 0.0}
+
+    for day in range(1, horizons[-1] + 1):
+        start = time.perf_counter()
+        features = np.array([model._process_entry(days[day - 1]) for days in rollouts])
+        timings['feature_extraction'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        features_normalized = model.scaler.transform(features)
+        timings['scaling'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        total_changes += np.asarray(model.modification_model.predict_on_batch(features_normalized))
+        timings['inference'] += time.perf_counter() - start
+
+        if day in horizons:
+            predicted[:, horizons.index(day)] = total_changes
+
+    return predicted, timings
+
+
+def time_reference_forecasts(model: HabitModificationModel, last_entries, horizon: int):
+    """Time the per-user path served by /api/suggestions, in seconds per forecast."""
+    start = time.perf_counter()
+    for entry in last_entries:
+        model.extrapolate_future_metrics({'entries': [entry]}, horizon)
+    return (time.perf_counter() - start) / len(last_entries)
+
+
+def evaluate(model_path: str, scaler_path: str, num_users: int, horizons, seed: int, reference_users: int):
+    model = HabitModificationModel()
+    model.load_trained_model(model_path, scaler_path)
+
+    horizons = sorted(set(horizons))
+    last_entries = generate_held_out_users(num_users, seed)
+    rollouts = generate_future_entries(model, last_entries, horizons[-1], seed)
+
+    truth = simulate_cumulative_changes(rollouts, horizons)
+    #warm up so graph tracing is not billed to the first day
+    num_features = model.modification_model.input_shape[1]
+    model.modification_model.predict_on_batch(model.scaler.transform(np.zeros((1, num_features))))
+    predicted, timings = predict_cumulative_changes(model, rollouts, horizons)
+
+    errors = predicted - truth
+    report = {
+        "numUsers": num_users,
+        "seed": seed,
+        "horizons": horizons,
+        "notes": [LABEL_MISMATCH_NOTE],
+        "errorByHorizon": [
+            {
+                "days": days,
+                "mae": dict(zip(TARGET_NAMES, np.abs(errors[:, i]).mean(axis=0).tolist())),
+                "rmse": dict(zip(TARGET_NAMES, np.sqrt((errors[:, i] ** 2).mean(axis=0)).tolist())),
+                "bias": dict(zip(TARGET_NAMES, errors[:, i].mean(axis=0).tolist()))
+            }
+            for i, days in enumerate(horizons)
+        ],
+        "inferenceCost": {
+            "batchedMsPerForecast": sum(timings.values()) / num_users * 1000,
+            "batchedMsPerForecastByStage": {stage: seconds / num_users * 1000 for stage, seconds in timings.items()},
+            "forecastDays": horizons[-1]
+        }
+    }
+
+    if reference_users > 0:
+        seconds = time_reference_forecasts(model, last_entries[:reference_users], horizons[-1])
+        report["inferenceCost"]["servedMsPerForecast"] = seconds * 1000
+
+    return report
+
+
+def print_report(report):
+    print(f"Held-out users: {report['numUsers']} (seed {report['seed']})")
+    print("Mean absolute error of total change vs simulator:")
+    columns = ['weightChange', 'cardiovascularEndurance']
+    print(f"{'days':>6} {'weight':>10} {'cardio':>10} {'muscle(avg)':>12}")
+    for row in report['errorByHorizon']:
+        muscle = [value for name, value in row['mae'].items() if name not in columns]
+        print(f"{row['days']:>6} {row['mae']['weightChange']:>10.3f} "
+              f"{row['mae']['cardiovascularEndurance']:>10.3f} {np.mean(muscle):>12.3f}")
+
+    for note in report['notes']:
+        print(f"Note: {note}")
+
+    cost = report['inferenceCost']
+    print(f"Inference cost for a {cost['forecastDays']} day forecast:")
+    print(f"  batched: {cost['batchedMsPerForecast']:.3f} ms/forecast "
+          + ", ".join(f"{stage} {ms:.3f}" for stage, ms in cost['batchedMsPerForecastByStage'].items()))
+    if 'servedMsPerForecast' in cost:
+        print(f"  served path (extrapolate_future_metrics): {cost['servedMsPerForecast']:.3f} ms/forecast")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Evaluate the habit model against the mock output simulator.")
+    parser.add_argument('--model', default=os.path.join(backend_dir, 'trained_habit_model.keras'))
+    parser.add_argument('--scaler', default=os.path.join(backend_dir, 'feature_scaler.pkl'))
+    parser.add_argument('--users', type=int, default=200, help="number of held-out mock users")
+    parser.add_argument('--horizons', type=int, nargs='+', default=[1, 7, 14, 30, 60, 90])
+    parser.add_argument('--seed', type=int, default=1234, help="seed for held-out users, keep it away from training data")
+    parser.add_argument('--reference-users', type=int, default=3,
+                        help="users to time through the served per-request path (0 to skip)")
+    parser.add_argument('--output', help="optional path to write the full report as JSON")
+    args = parser.parse_args()
+    if min(args.horizons) < 1:
+        parser.error("horizons must be at least 1 day")
+
+    report = evaluate(args.model, args.scaler, args.users, args.horizons, args.seed, args.reference_users)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
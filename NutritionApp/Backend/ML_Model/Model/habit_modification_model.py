@@ -6,10 +6,13 @@ import json
 import os
 import numpy as np
 import pickle
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 
 class HabitModificationModel:
-    def __init__(self):
+    def __init__(self, stage_timer=None):
+        #optional callable returning a context manager per stage name, used for latency metrics
+        self.stage_timer = stage_timer or (lambda stage: nullcontext())
         self.scaler = StandardScaler()
         self.modification_model = self._build_model()
         self.modification_model.compile(
@@ -147,10 +150,13 @@ class HabitModificationModel:
 
     def predict_metric_difference_for_entry(self, entry: Dict) -> np.ndarray:
         """Predict metric differences for a single entry."""
-        features = self._process_entry(entry)
-        features_array = np.array(features)
-        features_normalized = self.scaler.transform(features_array.reshape(1, -1))
-        prediction = self.modification_model.predict(features_normalized)[0]
+        with self.stage_timer('feature_extraction'):
+            features = self._process_entry(entry)
+            features_array = np.array(features)
+        with self.stage_timer('scaling'):
+            features_normalized = self.scaler.transform(features_array.reshape(1, -1))
+        with self.stage_timer('inference'):
+            prediction = self.modification_model.predict(features_normalized)[0]
         return prediction  #return the predicted differences as a numpy array
 
     def extrapolate_future_metrics(self, input_data: Dict, days_ahead: int) -> np.ndarray:
@@ -0,0 +1,91 @@
+import json
+import math
+
+from flask.json.provider import JSONProvider
+
+#orjson is optional, the stdlib encoder is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    #numpy arrays first, then numpy scalars (model output) and anything else float-like
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _replace_non_finite(obj):
+    """Copy of obj with NaN/inf floats replaced by None, matching what orjson writes."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(value) for value in obj]
+    if hasattr(obj, 'tolist') or hasattr(obj, 'item'):
+        return _replace_non_finite(_default(obj))
+    return obj
+
+
+#both backends write compact utf-8, stringify non-str keys and write NaN/inf as null
+_encoder = json.JSONEncoder(default=_default, separators=(',', ':'), ensure_ascii=False, allow_nan=False)
+
+
+def _stdlib_dumps(obj) -> bytes:
+    try:
+        return _encoder.encode(obj).encode('utf-8')
+    except ValueError:
+        #only payloads holding NaN/inf pay for the extra walk
+        return _encoder.encode(_replace_non_finite(obj)).encode('utf-8')
+
+
+def _stdlib_loads(data):
+    return json.loads(data)
+
+
+def _orjson_dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def _orjson_loads(data):
+    return orjson.loads(data)
+
+
+if orjson is not None:
+    BACKEND = 'orjson'
+    dumps, loads = _orjson_dumps, _orjson_loads
+else:
+    BACKEND = 'json'
+    dumps, loads = _stdlib_dumps, _stdlib_loads
+
+
+def load_file(path: str):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump_file(obj, path: str):
+    #compact output, the history file is machine-read only
+    with open(path, 'wb') as f:
+        f.write(dumps(obj))
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by the fastest available codec."""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
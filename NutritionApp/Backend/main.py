@@ -1,39 +1,185 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response, send_file, abort, stream_with_context
 from flask_cors import CORS
-import json
+import hmac
 import os
+import time
 from datetime import datetime
 import traceback
 
 from ML_Model.Model.habit_modification_model import HabitModificationModel
+from metrics import registry, timed_stage
+from profiling import ProfileStore, RequestSampler, start_profiler
+import json_codec
+from compression import negotiate_encoding, compress, compress_stream, should_compress
+from meal_recommender import MealRecommender
 
 app = Flask(__name__)
+app.json = json_codec.FastJSONProvider(app)
 CORS(app)
 
-#get paths to data files
+#responses at or above this size are compressed when the client accepts gzip/deflate
+compress_min_bytes = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+#history entries per NDJSON chunk in streamed exports
+export_chunk_entries = 64
+
 current_dir = os.path.dirname(os.path.abspath(__file__))
+
+#opt-in request profiling: X-Profile header, ?profile=1, or 1-in-N sampling via PROFILE_SAMPLE_EVERY
+profile_store = ProfileStore(
+    os.environ.get('PROFILE_DIR', os.path.join(current_dir, 'profiles')),
+    max_profiles=int(os.environ.get('PROFILE_MAX_PROFILES', 50))
+)
+profile_sampler = RequestSampler(int(os.environ.get('PROFILE_SAMPLE_EVERY', 0)))
+profile_admin_token = os.environ.get('PROFILE_ADMIN_TOKEN')
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.before_request
+def start_request_profiler():
+    if request.path.startswith('/admin/') or request.path == '/metrics':
+        return
+    #explicit opt-in is admin only so clients can't slow requests down or flush the buffer, sampling is server controlled
+    flagged = (
+        (request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1')
+        and is_profile_admin()
+    )
+    if profile_sampler.should_profile(flagged):
+        profiler = start_profiler()
+        if profiler is None:
+            #another profiler already owns this interpreter, let the caller know
+            g.profile_skipped = True
+            app.logger.warning('Profiling skipped for %s %s: another profiler is active', request.method, request.path)
+            return
+        g.profiler = profiler
+        g.profile_start = time.perf_counter()
+
+def finish_request_profile():
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return None
+    profiler.disable()
+    duration_ms = (time.perf_counter() - g.pop('profile_start')) * 1000
+    return profile_store.save(profiler, request.method, request.path, duration_ms)
+
+@app.after_request
+def save_request_profile(response):
+    profile_id = finish_request_profile()
+    if profile_id is not None:
+        response.headers['X-Profile-Id'] = profile_id
+    if g.pop('profile_skipped', False):
+        response.headers['X-Profile-Skipped'] = 'another profiler is active'
+    return response
+
+@app.teardown_request
+def stop_request_profiler(exc):
+    #after_request does not run when an exception propagates, never leave the thread profiled
+    finish_request_profile()
+
+@app.after_request
+def remember_response_status(response):
+    g.response_status = response.status_code
+    return response
+
+@app.teardown_request
+def record_request_metrics(exc):
+    #teardown also runs when an unhandled exception skips after_request (debug/propagating mode)
+    start = g.pop('request_start', None)
+    if start is not None:
+        status = 500 if exc is not None else g.pop('response_status', 500)
+        #label by url rule rather than raw path to keep the label set bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        registry.record_request(route, request.method, status, time.perf_counter() - start)
+
+@app.after_request
+def compress_response(response):
+    response.vary.add('Accept-Encoding')
+    if not should_compress(response, compress_min_bytes):
+        return response
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding:
+        response.set_data(compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(registry.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+def is_profile_admin():
+    #admin access stays disabled unless a token is configured
+    if not profile_admin_token:
+        return False
+    #compare bytes, compare_digest rejects non-ascii str
+    return hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), profile_admin_token.encode())
+
+def require_profile_admin():
+    if not is_profile_admin():
+        abort(403)
+
+@app.route('/admin/profiles', methods=['GET'])
+def list_profiles():
+    require_profile_admin()
+    return jsonify(profile_store.list())
+
+@app.route('/admin/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    require_profile_admin()
+    path = profile_store.path_for(name)
+    if path is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    try:
+        if request.args.get('format') == 'text':
+            return Response(profile_store.render_text(name), mimetype='text/plain')
+        return send_file(path, mimetype='application/octet-stream', as_attachment=True, download_name=name)
+    except FileNotFoundError:
+        #evicted by a concurrent save
+        return jsonify({'error': 'Profile not found'}), 404
+
+#get paths to data files
 exercise_path = os.path.join(current_dir, 'Datasets', 'exercise_calories.json')
 history_path = os.path.join(current_dir, 'Datasets', 'history.json')
 
 #load exercise data
-with open(exercise_path, 'r') as f:
-    exercise_data = json.load(f)
+exercise_data = json_codec.load_file(exercise_path)
+
+#nutrient matrix for meal recommendations, built once at startup
+meal_recommender = MealRecommender(json_codec.load_file(os.path.join(current_dir, 'Datasets', 'nutrition.json')))
 
 def load_history():
-    if os.path.exists(history_path):
-        with open(history_path, 'r') as f:
-            return json.load(f)
-    return {"entries": []}
+    with timed_stage('history_load'):
+        if os.path.exists(history_path):
+            return json_codec.load_file(history_path)
+        return {"entries": []}
 
 def save_history(history_data):
-    with open(history_path, 'w') as f:
-        json.dump(history_data, f, indent=2)
+    with timed_stage('history_save'):
+        json_codec.dump_file(history_data, history_path)
 
 @app.route('/api/history', methods=['GET'])
 def get_history():
     history_data = load_history()
     return jsonify(history_data['entries'])
 
+@app.route('/api/history/export', methods=['GET'])
+def export_history():
+    entries = load_history()['entries']
+
+    def generate_chunks():
+        #one json document per line, sent in batches so the body is never materialized
+        for start in range(0, len(entries), export_chunk_entries):
+            batch = entries[start:start + export_chunk_entries]
+            yield b''.join(json_codec.dumps(entry) + b'\n' for entry in batch)
+
+    chunks = generate_chunks()
+    headers = {'Content-Disposition': 'attachment; filename=history.ndjson'}
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding:
+        chunks = compress_stream(chunks, encoding)
+        headers['Content-Encoding'] = encoding
+    return Response(stream_with_context(chunks), mimetype='application/x-ndjson', headers=headers)
+
 @app.route('/api/history', methods=['POST'])
 def add_history_entry():
     data = request.json
@@ -125,11 +271,12 @@ def get_suggestions():
         input_data = load_history()
 
         #initialize the model
-        model = HabitModificationModel()
         model_path = os.path.join(current_dir, 'trained_habit_model.keras')
         scaler_path = os.path.join(current_dir, 'feature_scaler.pkl')
-        
-        model.load_trained_model(model_path, scaler_path)
+
+        with timed_stage('model_load'):
+            model = HabitModificationModel(stage_timer=timed_stage)
+            model.load_trained_model(model_path, scaler_path)
 
         #get predictions from the model
         total_changes = model.extrapolate_future_metrics(input_data, int(timeframe_days))
@@ -157,20 +304,50 @@ def get_suggestions():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/recommendations', methods=['POST'])
+def get_recommendations():
+    data = request.get_json(silent=True) or {}
+    target = data.get('target')
+    if not isinstance(target, dict):
+        return jsonify({'error': 'Missing target parameter'}), 400
+
+    try:
+        k = int(data.get('k', 10))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'k must be an integer'}), 400
+
+    food_group = data.get('foodGroup')
+    if food_group is not None and not isinstance(food_group, str):
+        return jsonify({'error': 'foodGroup must be a string'}), 400
+
+    #explicit totals win, otherwise use what has been logged for the day
+    totals = data.get('totals')
+    if not isinstance(totals, dict):
+        date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        entry = next((entry for entry in load_history()['entries'] if entry['date'] == date), None)
+        totals = MealRecommender.totals_from_entry(entry)
+
+    try:
+        with timed_stage('recommendation'):
+            result = meal_recommender.recommend(totals, target, k=max(k, 1), food_group=food_group)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(result)
+
 @app.route('/api/nutrition/search', methods=['GET'])
 def search_nutrition():
     query = request.args.get('query', '').lower()
     
-    with open(os.path.join(current_dir, 'Datasets', 'nutrition.json'), 'r') as f:
-        nutrition_data = json.load(f)
+    with timed_stage('nutrition_load'):
+        nutrition_data = json_codec.load_file(os.path.join(current_dir, 'Datasets', 'nutrition.json'))
     
     results = [item for item in nutrition_data 
               if query in item['name'].lower()]
     return jsonify(results[:10])  #limit to 10 results
 
 #load the exercises dataset
-with open('Datasets/exercises.json', 'r') as f:
-    exercises_data = json.load(f)
+exercises_data = json_codec.load_file('Datasets/exercises.json')
 
 @app.route('/api/workouts/search', methods=['GET'])
 def search_workouts():
@@ -0,0 +1,101 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+#nutrient columns of the matrix, named as in nutrition.json
+NUTRIENTS = ['calories', 'fat', 'protein', 'carbohydrates', 'sugars', 'saturatedFats']
+
+#history entry keys holding the day's logged totals for each nutrient
+TOTAL_KEYS = {
+    'calories': 'totalCaloriesConsumed',
+    'fat': 'totalFat',
+    'protein': 'totalProtein',
+    'carbohydrates': 'totalCarbohydrates',
+    'sugars': 'totalSugars',
+    'saturatedFats': 'totalSaturatedFats'
+}
+
+
+class MealRecommender:
+    """Scores every food against the remaining nutrient gap for the day in one vectorized pass."""
+
+    def __init__(self, nutrition_data: List[Dict], max_servings: float = 3.0, serving_step: float = 0.25):
+        self.names = [item['name'] for item in nutrition_data]
+        self.food_groups = np.array([(item.get('foodGroup') or '').strip() for item in nutrition_data])
+        #missing values (None) count as zero, same as the mock data generator
+        self.matrix = np.array(
+            [[item.get(nutrient) or 0 for nutrient in NUTRIENTS] for item in nutrition_data],
+            dtype=np.float64
+        )
+        self.max_servings = max_servings
+        self.serving_step = serving_step
+
+    @staticmethod
+    def totals_from_entry(entry: Optional[Dict]) -> Dict[str, float]:
+        entry = entry or {}
+        return {nutrient: entry.get(key, 0) or 0 for nutrient, key in TOTAL_KEYS.items()}
+
+    def recommend(self, totals: Dict[str, float], target: Dict[str, float],
+                  k: int = 10, food_group: Optional[str] = None) -> Dict:
+        """Return the top-k foods (with servings) that best close the gap between totals and target."""
+        parsed = {}
+        for i, nutrient in enumerate(NUTRIENTS):
+            if target.get(nutrient) is None:
+                continue
+            value = float(target[nutrient])
+            if not np.isfinite(value):
+                raise ValueError(f"target value for {nutrient} must be a finite number")
+            #only positive targets take part, zero means no target for that nutrient
+            if value > 0:
+                parsed[i] = value
+        if not parsed:
+            raise ValueError(f"target must contain a positive value for at least one of: {', '.join(NUTRIENTS)}")
+
+        columns = list(parsed)
+        target_values = np.array(list(parsed.values()))
+        consumed = np.array([float(totals.get(NUTRIENTS[i], 0)) for i in columns])
+        remaining = np.maximum(target_values - consumed, 0.0)
+
+        candidates = np.arange(len(self.names))
+        if food_group:
+            candidates = np.flatnonzero(self.food_groups == food_group.strip())
+        foods = self.matrix[candidates][:, columns]
+
+        #normalize each nutrient by its target so calories don't drown out grams
+        scaled_foods = foods / target_values
+        scaled_remaining = remaining / target_values
+
+        #least-squares servings per food, snapped to the serving step and clipped
+        denominator = np.einsum('ij,ij->i', scaled_foods, scaled_foods)
+        numerator = scaled_foods @ scaled_remaining
+        with np.errstate(divide='ignore', invalid='ignore'):
+            servings = np.where(denominator > 0, numerator / denominator, 0.0)
+        servings = np.clip(np.round(servings / self.serving_step) * self.serving_step, 0.0, self.max_servings)
+
+        residual = scaled_remaining - servings[:, None] * scaled_foods
+        scores = np.sqrt(np.einsum('ij,ij->i', residual, residual))
+        #foods that can't contribute anything are never suggested
+        scores[servings <= 0] = np.inf
+
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            top = np.array([], dtype=int)
+        else:
+            top = np.argpartition(scores, k - 1)[:k]
+            top = top[np.argsort(scores[top])]
+
+        return {
+            "remaining": {NUTRIENTS[i]: float(value) for i, value in zip(columns, remaining)},
+            "foods": [self._format_food(candidates[i], servings[i], scores[i]) for i in top]
+        }
+
+    def _format_food(self, index: int, servings: float, score: float) -> Dict:
+        food = {
+            "name": self.names[index],
+            "foodGroup": self.food_groups[index],
+            "servings": float(servings),
+            "score": float(score)
+        }
+        for nutrient, value in zip(NUTRIENTS, self.matrix[index] * servings):
+            food[nutrient] = round(float(value), 2)
+        return food
@@ -0,0 +1,129 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+#histogram bucket upper bounds in seconds (prometheus style, +Inf is implicit)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative latency histogram. Observing is a bisect and two adds, formatting only happens on scrape."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe store for request counters, error counters and latency histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._errors = {}
+        self._route_latency = {}
+        self._stage_latency = {}
+
+    def record_request(self, route: str, method: str, status: int, seconds: float):
+        with self._lock:
+            key = (route, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if status >= 500:
+                error_key = (route, method)
+                self._errors[error_key] = self._errors.get(error_key, 0) + 1
+            histogram = self._route_latency.get((route, method))
+            if histogram is None:
+                histogram = self._route_latency[(route, method)] = Histogram()
+            histogram.observe(seconds)
+
+    def record_stage(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self._stage_latency.get(stage)
+            if histogram is None:
+                histogram = self._stage_latency[stage] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timed_stage(self, stage: str):
+        """Time the wrapped block and record it under the given stage name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start)
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            requests = dict(self._requests)
+            errors = dict(self._errors)
+            route_latency = {key: _snapshot(h) for key, h in self._route_latency.items()}
+            stage_latency = {key: _snapshot(h) for key, h in self._stage_latency.items()}
+
+        lines = [
+            '# HELP http_requests_total Total HTTP requests by route, method and status.',
+            '# TYPE http_requests_total counter'
+        ]
+        for (route, method, status), value in sorted(requests.items()):
+            lines.append(f'http_requests_total{_labels(route=route, method=method, status=status)} {value}')
+
+        lines += [
+            '# HELP http_request_errors_total Total HTTP requests that ended in a 5xx response.',
+            '# TYPE http_request_errors_total counter'
+        ]
+        for (route, method), value in sorted(errors.items()):
+            lines.append(f'http_request_errors_total{_labels(route=route, method=method)} {value}')
+
+        lines += [
+            '# HELP http_request_duration_seconds HTTP request latency by route and method.',
+            '# TYPE http_request_duration_seconds histogram'
+        ]
+        for (route, method), histogram in sorted(route_latency.items()):
+            lines.extend(_histogram_lines('http_request_duration_seconds', histogram, route=route, method=method))
+
+        lines += [
+            '# HELP stage_duration_seconds Latency of internal request stages.',
+            '# TYPE stage_duration_seconds histogram'
+        ]
+        for stage, histogram in sorted(stage_latency.items()):
+            lines.extend(_histogram_lines('stage_duration_seconds', histogram, stage=stage))
+
+        return '\n'.join(lines) + '\n'
+
+
+def _snapshot(histogram: Histogram):
+    return histogram.buckets, list(histogram.counts), histogram.total, histogram.count
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+def _histogram_lines(name: str, snapshot, **labels):
+    buckets, counts, total, count = snapshot
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, counts):
+        cumulative += bucket_count
+        lines.append(f'{name}_bucket{_labels(**labels, le=repr(bound))} {cumulative}')
+    lines.append(f'{name}_bucket{_labels(**labels, le="+Inf")} {count}')
+    lines.append(f'{name}_sum{_labels(**labels)} {total}')
+    lines.append(f'{name}_count{_labels(**labels)} {count}')
+    return lines
+
+
+#process-wide registry shared by the app and the model
+registry = MetricsRegistry()
+timed_stage = registry.timed_stage
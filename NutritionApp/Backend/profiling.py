@@ -0,0 +1,94 @@
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import re
+import threading
+from datetime import datetime
+
+
+class ProfileStore:
+    """Bounded on-disk ring buffer of cProfile dumps, oldest profiles are evicted first."""
+
+    def __init__(self, directory: str, max_profiles: int = 50):
+        self.directory = directory
+        #at least one slot, otherwise the eviction slice [:-0] would keep everything
+        self.max_profiles = max(1, max_profiles)
+        self._lock = threading.Lock()
+
+    def save(self, profiler: cProfile.Profile, method: str, path: str, duration_ms: float) -> str:
+        #filename carries the metadata so listing never has to open the dumps
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', path).strip('-') or 'root'
+        timestamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        name = f'{timestamp}_{method}_{slug}_{round(duration_ms)}ms.prof'
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.directory, name))
+            for stale in self._names()[:-self.max_profiles]:
+                os.remove(os.path.join(self.directory, stale))
+        return name
+
+    def list(self):
+        #hold the lock so save() can't evict a profile between listing and stat
+        with self._lock:
+            return [self._describe(name) for name in reversed(self._names())]
+
+    def _describe(self, name: str):
+        timestamp, method, slug, duration = name[:-len('.prof')].split('_', 3)
+        return {
+            'name': name,
+            'timestamp': datetime.strptime(timestamp, '%Y%m%dT%H%M%S%f').isoformat(),
+            'method': method,
+            'path': '/' + slug.replace('-', '/') if slug != 'root' else '/',
+            'durationMs': int(duration[:-len('ms')]),
+            'bytes': os.path.getsize(os.path.join(self.directory, name))
+        }
+
+    def path_for(self, name: str):
+        """Return the on-disk path of a stored profile, or None if it is not in the buffer.
+
+        The profile can still be evicted right after this returns, readers should expect FileNotFoundError.
+        """
+        with self._lock:
+            if name not in self._names():
+                return None
+        return os.path.join(self.directory, name)
+
+    def render_text(self, name: str, limit: int = 50) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(os.path.join(self.directory, name), stream=stream)
+        stats.sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+    def _names(self):
+        if not os.path.isdir(self.directory):
+            return []
+        #timestamp prefix makes lexical order chronological
+        return sorted(name for name in os.listdir(self.directory) if name.endswith('.prof'))
+
+
+class RequestSampler:
+    """Decides which requests get profiled: explicit opt-in flag, or every Nth request."""
+
+    def __init__(self, sample_every: int = 0):
+        self.sample_every = sample_every
+        self._counter = itertools.count(1)
+
+    def should_profile(self, flagged: bool) -> bool:
+        if flagged:
+            return True
+        if self.sample_every <= 0:
+            return False
+        return next(self._counter) % self.sample_every == 0
+
+
+def start_profiler():
+    """Start a cProfile for the current thread, or return None if another profiler is already active."""
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    return profiler
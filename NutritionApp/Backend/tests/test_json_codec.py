@@ -0,0 +1,31 @@
+import math
+
+import numpy as np
+import pytest
+
+import json_codec
+
+BACKENDS = [pytest.param(json_codec._stdlib_dumps, id='json')]
+if json_codec.orjson is not None:
+    BACKENDS.append(pytest.param(json_codec._orjson_dumps, id='orjson'))
+
+CASES = [
+    ({'a': np.float64(1.5), 'b': np.int64(3), 'c': np.float32(2)}, b'{"a":1.5,"b":3,"c":2.0}'),
+    ({'values': np.arange(3), 'matrix': np.array([[1.5, 2.0]])}, b'{"values":[0,1,2],"matrix":[[1.5,2.0]]}'),
+    ({1: 2, 'x': {3: 'y'}}, b'{"1":2,"x":{"3":"y"}}'),
+    ({'name': 'Crème brûlée', 'emoji': '🍎'}, '{"name":"Crème brûlée","emoji":"🍎"}'.encode('utf-8')),
+    ({'nan': math.nan, 'inf': [math.inf], 'np': np.float64('nan'), 'arr': np.array([1.0, np.nan])},
+     b'{"nan":null,"inf":[null],"np":null,"arr":[1.0,null]}'),
+]
+
+
+@pytest.mark.parametrize('dumps', BACKENDS)
+@pytest.mark.parametrize('obj, expected', CASES)
+def test_backends_serialize_identically(dumps, obj, expected):
+    assert dumps(obj) == expected
+
+
+@pytest.mark.parametrize('dumps', BACKENDS)
+def test_unsupported_types_raise_type_error(dumps):
+    with pytest.raises(TypeError):
+        dumps({'value': object()})
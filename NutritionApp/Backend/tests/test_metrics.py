@@ -0,0 +1,44 @@
+from metrics import MetricsRegistry
+
+
+def _samples(text, name):
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith(name + '{') or line.startswith(name + ' '):
+            key, value = line.rsplit(' ', 1)
+            samples[key] = float(value)
+    return samples
+
+
+def test_histogram_buckets_are_cumulative_and_inf_matches_count():
+    registry = MetricsRegistry()
+    #0.005 sits exactly on a bound and must land in that bucket (le is inclusive)
+    for seconds in (0.0005, 0.005, 0.03, 0.03, 20.0):
+        registry.record_stage('inference', seconds)
+
+    text = registry.render_prometheus()
+    buckets = _samples(text, 'stage_duration_seconds_bucket')
+    count = _samples(text, 'stage_duration_seconds_count')['stage_duration_seconds_count{stage="inference"}']
+
+    values = list(buckets.values())
+    assert values == sorted(values)
+    assert buckets['stage_duration_seconds_bucket{stage="inference",le="0.001"}'] == 1
+    assert buckets['stage_duration_seconds_bucket{stage="inference",le="0.005"}'] == 2
+    assert buckets['stage_duration_seconds_bucket{stage="inference",le="0.05"}'] == 4
+    assert buckets['stage_duration_seconds_bucket{stage="inference",le="10.0"}'] == 4
+    assert buckets['stage_duration_seconds_bucket{stage="inference",le="+Inf"}'] == count == 5
+
+
+def test_request_counters_and_errors():
+    registry = MetricsRegistry()
+    registry.record_request('/api/history', 'GET', 200, 0.01)
+    registry.record_request('/api/history', 'GET', 200, 0.02)
+    registry.record_request('/api/suggestions', 'POST', 500, 0.5)
+
+    text = registry.render_prometheus()
+    requests = _samples(text, 'http_requests_total')
+    errors = _samples(text, 'http_request_errors_total')
+
+    assert requests['http_requests_total{route="/api/history",method="GET",status="200"}'] == 2
+    assert requests['http_requests_total{route="/api/suggestions",method="POST",status="500"}'] == 1
+    assert errors == {'http_request_errors_total{route="/api/suggestions",method="POST"}': 1}